@@ -3,12 +3,72 @@ import sqlite3
 import os
 import re
 import html
+import queue
+from contextlib import contextmanager
+from functools import lru_cache
+from selectolax.lexbor import LexborHTMLParser
 
 app = Flask(__name__)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, 'articles.db')
 
+FIELD_MAPPING = {
+    'title': 'title',
+    'author': 'author',
+    'category': 'category',
+    'content': 'content_html',
+    'url': 'url'
+}
+FTS_MIN_KEYWORD_LENGTH = 3
+PREVIEW_HTML_LENGTH = 2000
+
+POOL_SIZE = 8
+
+# werkzeug serves every request on a fresh thread, so connections are pooled, not thread-local
+_pool = queue.LifoQueue(maxsize=POOL_SIZE)
+
+def _connect() -> sqlite3.Connection:
+    """
+    args:
+        None
+    return:
+        conn: [sqlite3.Connection]
+    """
+    # journal_mode=WAL is persisted in the db file by init_db.py
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA mmap_size=268435456')
+    conn.execute('PRAGMA cache_size=-65536')
+    return conn
+
+@contextmanager
+def get_conn():
+    """
+    args:
+        None
+    return:
+        conn: [sqlite3.Connection] borrowed from the pool, returned on exit
+    """
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = _connect()
+    try:
+        yield conn
+    finally:
+        try:
+            _pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+_WS_RE = re.compile(r'\s+')
+
+@lru_cache(maxsize=256)
+def _kw_re(keyword: str) -> re.Pattern:
+    return re.compile(f'({re.escape(keyword)})', re.IGNORECASE)
+
 def extract_text_from_html(html_content: str, max_length=200) -> str:
     """
     args:
@@ -17,47 +77,106 @@ def extract_text_from_html(html_content: str, max_length=200) -> str:
     return:
         text: [str] 
     """
-    text = re.sub(r'<[^>]+>', '', html_content)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text[:max_length]
+    text = LexborHTMLParser(html_content).text(separator=' ')
+    text = _WS_RE.sub(' ', text).strip()
+    # the parser decodes entities, re-escape since snippets are rendered with |safe
+    return html.escape(text[:max_length], quote=False)
 
-def get_context_snippet(text: str, keyword: str, context_length=100) -> str:
+def get_context_snippet(text: str, keyword: str, context_length=100, highlight_re=None) -> str:
     """
     args:
         text: [str]
         keyword: [str]
         context_length: [int]
+        highlight_re: [re.Pattern] marks every match, defaults to keyword only
     return:
         snippet: [str]
     """
     if not keyword or not text:
         return text[:context_length] + '...' if len(text) > context_length else text
     
+    if highlight_re is None:
+        highlight_re = _kw_re(keyword)
+    
     text_lower = text.lower()
     keyword_lower = keyword.lower()
     
     pos = text_lower.find(keyword_lower)
     if pos == -1:
-        return text[:context_length] + '...' if len(text) > context_length else text
+        snippet = text[:context_length] + '...' if len(text) > context_length else text
+        return highlight_re.sub(r'<mark>\1</mark>', snippet)
     
     start = max(0, pos - context_length // 2)
     end = min(len(text), pos + len(keyword) + context_length // 2)
     
-    snippet = text[start:end]
+    snippet = f"{'...' if start > 0 else ''}{text[start:end]}{'...' if end < len(text) else ''}"
+    snippet = highlight_re.sub(r'<mark>\1</mark>', snippet)
     
-    if start > 0:
-        snippet = '...' + snippet
-    if end < len(text):
-        snippet = snippet + '...'
+    return snippet
+
+@lru_cache(maxsize=256)
+def _search_sql(search_fields: tuple, has_match: bool, like_count: int, keyword_count: int) -> tuple:
+    """
+    args:
+        search_fields: [tuple]
+        has_match: [bool] keywords long enough for the FTS index
+        like_count: [int] keywords matched with LIKE instead
+        keyword_count: [int]
+    return:
+        query, count_query: [tuple] constant text per shape, so sqlite3 reuses the prepared statement
+    """
+    db_fields = [FIELD_MAPPING[field] for field in search_fields]
     
-    snippet = re.sub(
-        f'({re.escape(keyword)})',
-        r'<mark>\1</mark>',
-        snippet,
-        flags=re.IGNORECASE
-    )
+    conditions = []
+    if has_match:
+        from_clause = 'FROM articles_fts f JOIN articles a ON a.id = f.rowid'
+        conditions.append('articles_fts MATCH ?')
+    else:
+        from_clause = 'FROM articles a'
+    for _ in range(like_count):
+        conditions.append('(' + ' OR '.join(f'a.{db_field} LIKE ?' for db_field in db_fields) + ')')
     
-    return snippet
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    # the full HTML blob is only needed to build content snippets
+    if 'content' in search_fields:
+        content_column = 'a.content_html'
+    else:
+        content_column = f'substr(a.content_html, 1, {PREVIEW_HTML_LENGTH})'
+    
+    # let SQLite report which metadata field matched instead of rescanning rows in Python
+    flag_columns = []
+    for field in ('title', 'author', 'category'):
+        if field in search_fields:
+            flag_columns.append('(' + ' OR '.join([f'a.{field} LIKE ?'] * keyword_count) + ')')
+        else:
+            flag_columns.append('0')
+    
+    query = f'''
+    SELECT a.id, a.title, a.author, a.url, a.category, {content_column}, a.created_at,
+           {', '.join(flag_columns)}
+    {from_clause}
+    {where_clause}
+    ORDER BY a.id DESC
+    LIMIT ? OFFSET ?
+    '''
+    count_query = f'SELECT COUNT(*) {from_clause} {where_clause}'
+    return query, count_query
+
+def _db_version() -> int:
+    """
+    args:
+        None
+    return:
+        version: [int] newest mtime of the database and its WAL file
+    """
+    version = 0
+    for path in (DB_PATH, DB_PATH + '-wal'):
+        try:
+            version = max(version, os.stat(path).st_mtime_ns)
+        except OSError:
+            pass
+    return version
 
 def search_articles(keyword='', search_fields=None, page=1, per_page=10) -> tuple:
     """
@@ -69,97 +188,97 @@ def search_articles(keyword='', search_fields=None, page=1, per_page=10) -> tupl
     return:
         articles, total: [tuple]
     """
-    if search_fields is None:
+    # unknown fields would leave no MATCH/LIKE condition and return every article
+    search_fields = [field for field in search_fields or () if field in FIELD_MAPPING]
+    if not search_fields:
         search_fields = ['title', 'author', 'category']
     
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    keywords = tuple(k.strip() for k in keyword.split() if k.strip())
+    if not keywords:
+        return [], 0
     
-    field_mapping = {
-        'title': 'title',
-        'author': 'author',
-        'category': 'category',
-        'content': 'content_html',
-        'url': 'url'
-    }
-    
-    conditions = []
-    params = []
+    # articles only change through the scraper, so the db mtime busts stale entries
+    return _search_articles(keywords, tuple(search_fields), page, per_page, _db_version())
+
+@lru_cache(maxsize=512)
+def _search_articles(keywords: tuple, search_fields: tuple, page: int, per_page: int,
+                     db_version: int) -> tuple:
+    """
+    args:
+        keywords: [tuple]
+        search_fields: [tuple]
+        page: [int]
+        per_page: [int]
+        db_version: [int] cache key only
+    return:
+        articles, total: [tuple]
+    """
+    db_fields = [FIELD_MAPPING[field] for field in search_fields]
+    match_keywords = [kw for kw in keywords if len(kw) >= FTS_MIN_KEYWORD_LENGTH]
+    # trigram index cannot look up tokens shorter than 3 chars
+    like_keywords = [kw for kw in keywords if len(kw) < FTS_MIN_KEYWORD_LENGTH]
     
-    if keyword:
-        keywords = [k.strip() for k in keyword.split() if k.strip()]
-        if keywords:
-            keyword_conditions = []
-            for kw in keywords:
-                field_conditions = []
-                for field in search_fields:
-                    db_field = field_mapping.get(field, field)
-                    field_conditions.append(f"{db_field} LIKE ?")
-                    params.append(f'%{kw}%')
-                if field_conditions:
-                    keyword_conditions.append(f"({' OR '.join(field_conditions)})")
-            if keyword_conditions:
-                conditions.append(f"({' AND '.join(keyword_conditions)})")
+    query, count_query = _search_sql(search_fields, bool(match_keywords), len(like_keywords), len(keywords))
     
-    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    params = []
+    if match_keywords:
+        column_filter = '{' + ' '.join(db_fields) + '}'
+        match_terms = []
+        for kw in match_keywords:
+            phrase = kw.replace('"', '""')
+            match_terms.append(f'{column_filter} : "{phrase}"')
+        params.append(' AND '.join(match_terms))
+    for kw in like_keywords:
+        params.extend([f'%{kw}%'] * len(db_fields))
     
-    count_query = f'SELECT COUNT(*) FROM articles {where_clause}'
-    cursor.execute(count_query, params)
-    total = cursor.fetchone()[0]
+    flag_params = []
+    for field in ('title', 'author', 'category'):
+        if field in search_fields:
+            flag_params.extend(f'%{kw}%' for kw in keywords)
     
     offset = (page - 1) * per_page
-    query = f'''
-    SELECT id, title, author, url, category, content_html, created_at
-    FROM articles
-    {where_clause}
-    ORDER BY id DESC
-    LIMIT ? OFFSET ?
-    '''
-    
-    cursor.execute(query, params + [per_page, offset])
-    results = cursor.fetchall()
-    conn.close()
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, flag_params + params + [per_page + 1, offset])
+        results = cursor.fetchall()
+        has_more = len(results) > per_page
+        results = results[:per_page]
+        
+        # a short page is the last one, so the total is known without counting
+        if has_more or (not results and offset):
+            cursor.execute(count_query, params)
+            total = cursor.fetchone()[0]
+        else:
+            total = offset + len(results)
     
     articles = []
     
-    keywords_list = [k.strip() for k in keyword.split() if k.strip()] if keyword else []
+    # one alternation per request, longest first so overlapping keywords mark the full match
+    highlight_re = re.compile(
+        '(' + '|'.join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True)) + ')',
+        re.IGNORECASE
+    )
     
     for row in results:
-        article_id, title, author, url, category, content_html, created_at = row
-        snippet = ''
-        if keywords_list:
-            if 'content' in search_fields and content_html:
-                text = extract_text_from_html(content_html, max_length=1000)
-                snippet = get_context_snippet(text, keywords_list[0], context_length=80)
-                for kw in keywords_list[1:]:
-                    snippet = re.sub(
-                        f'({re.escape(kw)})',
-                        r'<mark>\1</mark>',
-                        snippet,
-                        flags=re.IGNORECASE
-                    )
+        (article_id, title, author, url, category, content_html, created_at,
+         in_title, in_author, in_category) = row
+        if 'content' in search_fields and content_html:
+            text = extract_text_from_html(content_html, max_length=1000)
+            snippet = get_context_snippet(text, keywords[0], context_length=80,
+                                          highlight_re=highlight_re)
+        else:
+            matched_parts = []
+            if in_title:
+                matched_parts.append(f'标题: {title}')
+            if in_author:
+                matched_parts.append(f'作者: {author}')
+            if in_category:
+                matched_parts.append(f'目录: {category}')
+            if matched_parts:
+                snippet = ' | '.join(matched_parts)
             else:
-                matched_parts = []
-                if 'title' in search_fields:
-                    for kw in keywords_list:
-                        if kw.lower() in title.lower():
-                            matched_parts.append(f'标题: {title}')
-                            break
-                if 'author' in search_fields:
-                    for kw in keywords_list:
-                        if kw.lower() in author.lower():
-                            matched_parts.append(f'作者: {author}')
-                            break
-                if 'category' in search_fields and category:
-                    for kw in keywords_list:
-                        if kw.lower() in category.lower():
-                            matched_parts.append(f'目录: {category}')
-                            break
-                if matched_parts:
-                    snippet = ' | '.join(matched_parts)
-                else:
-                    text = extract_text_from_html(content_html or '', max_length=200)
-                    snippet = text + '...' if text else '无内容'
+                text = extract_text_from_html(content_html or '', max_length=200)
+                snippet = f'{text}...' if text else '无内容'
         
         articles.append({
             'id': article_id,
@@ -200,17 +319,14 @@ def index():
 
 @app.route('/article/<int:article_id>')
 def article_detail(article_id):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-    SELECT id, title, author, url, category, content_html
-    FROM articles
-    WHERE id = ?
-    ''', (article_id,))
-    
-    row = cursor.fetchone()
-    conn.close()
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+        SELECT id, title, author, url, category, content_html
+        FROM articles
+        WHERE id = ?
+        ''', (article_id,))
+        row = cursor.fetchone()
     
     if not row:
         return "文章不存在", 404
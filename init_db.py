@@ -5,6 +5,8 @@ def init_database():
     db_path = 'articles.db'
     
     conn = sqlite3.connect(db_path)
+    # WAL is persistent, readers in app.py no longer need to set it per connection
+    conn.execute('PRAGMA journal_mode=WAL')
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -23,6 +25,41 @@ def init_database():
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_author ON articles(author)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_category ON articles(category)')
     
+    # full-text index over articles, trigram keeps LIKE-style substring matching for CJK text
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'")
+    fts_exists = cursor.fetchone() is not None
+    
+    cursor.execute('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title, author, category, content_html, url,
+        content='articles', content_rowid='id', tokenize='trigram'
+    )
+    ''')
+    
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, author, category, content_html, url)
+        VALUES (new.id, new.title, new.author, new.category, new.content_html, new.url);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, author, category, content_html, url)
+        VALUES ('delete', old.id, old.title, old.author, old.category, old.content_html, old.url);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, author, category, content_html, url)
+        VALUES ('delete', old.id, old.title, old.author, old.category, old.content_html, old.url);
+        INSERT INTO articles_fts(rowid, title, author, category, content_html, url)
+        VALUES (new.id, new.title, new.author, new.category, new.content_html, new.url);
+    END
+    ''')
+    
+    if not fts_exists:
+        cursor.execute("INSERT INTO articles_fts(articles_fts) VALUES('rebuild')")
+    
     conn.commit()
     conn.close()
     
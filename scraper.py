@@ -1,14 +1,15 @@
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 import sqlite3
-import time
-import re
+import asyncio
 import os
-import requests
+import aiohttp
 import hashlib
+import tempfile
 import logging
+from functools import lru_cache
 from datetime import datetime
-from concurrent.futures import ProcessPoolExecutor, as_completed
-import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from selectolax.lexbor import LexborHTMLParser
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 STATIC_DIR = os.path.join(BASE_DIR, 'static', 'images')
@@ -17,6 +18,47 @@ DB_PATH = os.path.join(BASE_DIR, 'articles.db')
 log_file = os.path.join(BASE_DIR, f'scraperLogs/scraper_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
 
 ARTICLE_VERSION_THRESHOLD = 16567
+SAVE_BATCH_SIZE = 50
+IMAGE_CONNECTIONS = 32
+IMAGE_RETRIES = 2
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+NEW_VIEWER_SELECTOR = '.ne-viewer-body'
+OLD_CONTENT_SELECTOR = '.detail_content, #markdown-body'
+# blank/nonexistent ids never render the viewer, keep their cost near the old fixed sleeps
+NEW_VIEWER_TIMEOUT = 3000
+OLD_CONTENT_TIMEOUT = 1000
+SCROLL_TIMEOUT = 15000
+
+# images are re-fetched by localize_images, stylesheets are kept for inner_text/scroll layout
+BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media'}
+
+# polled by wait_for_function: one viewport per poll so lazy blocks on the way render,
+# done once at the bottom and scrollHeight stopped growing since the previous poll
+SCROLL_JS = """
+    () => {
+        const height = document.body.scrollHeight;
+        window.scrollBy(0, window.innerHeight);
+        const atBottom = window.innerHeight + window.scrollY >= height;
+        const settled = atBottom && window.__xzLastHeight === height;
+        window.__xzLastHeight = height;
+        return settled;
+    }
+"""
+UNHIDE_JS = """
+    () => {
+        document.querySelectorAll('.ne-codeblock').forEach(el => {
+            el.style.display = 'block';
+        });
+        document.querySelectorAll('[style*="display: none"]').forEach(el => {
+            el.style.display = '';
+        });
+    }
+"""
+
+IMAGE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0',
+    'Referer': 'https://xz.aliyun.com/'
+}
 
 def setup_logger() -> logging.Logger:
     """
@@ -35,105 +77,238 @@ def setup_logger() -> logging.Logger:
 
 logger = setup_logger()
 
-def article_exists(article_id: int) -> bool:
+_conn = None
+# sqlite connections are bound to their thread, keep all db work on one
+_DB_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
+def get_conn() -> sqlite3.Connection:
     """
     args:
-        article_id: [int]
+        None
     return:
-        exists: [bool]
+        conn: [sqlite3.Connection] only used from _DB_EXECUTOR
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    try:
-        cursor.execute('SELECT 1 FROM articles WHERE id = ? LIMIT 1', (article_id,))
-        return cursor.fetchone() is not None
-    finally:
-        conn.close()
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(DB_PATH)
+        _conn.execute('PRAGMA journal_mode=WAL')
+        _conn.execute('PRAGMA synchronous=NORMAL')
+        # REPLACE only fires the articles_fts delete trigger with recursive triggers on
+        _conn.execute('PRAGMA recursive_triggers = ON')
+    return _conn
 
-def download_image(img_url: str) -> str:
+async def run_db(func, *args):
+    """
+    args:
+        func: [callable] blocking db function
+        args: [tuple]
+    return:
+        result: [any]
+    """
+    return await asyncio.get_running_loop().run_in_executor(_DB_EXECUTOR, func, *args)
+
+def existing_article_ids(start_id: int, end_id: int) -> set:
+    """
+    args:
+        start_id: [int]
+        end_id: [int]
+    return:
+        article_ids: [set]
+    """
+    cursor = get_conn().cursor()
+    cursor.execute('SELECT id FROM articles WHERE id BETWEEN ? AND ?', (start_id, end_id))
+    return {row[0] for row in cursor.fetchall()}
+
+_saved_images = set()
+
+@lru_cache(maxsize=4096)
+def _local_image_name(img_url: str) -> str:
     """
     args:
         img_url: [str]
+    return:
+        local_filename: [str]
+    """
+    # md5 is only a filename hash here, keep it so existing images still resolve
+    filename = hashlib.md5(img_url.encode(), usedforsecurity=False).hexdigest()
+    ext = os.path.splitext(img_url.split('?')[0])[-1] or '.png'
+    return filename + ext
+
+async def download_image(session: aiohttp.ClientSession, img_url: str) -> str:
+    """
+    args:
+        session: [aiohttp.ClientSession]
+        img_url: [str]
     return:
         local_img_url: [str]
     """
-    try:
-        filename = hashlib.md5(img_url.encode()).hexdigest()
-        ext = os.path.splitext(img_url.split('?')[0])[-1] or '.png'
-        local_filename = filename + ext
-        local_path = os.path.join(STATIC_DIR, local_filename)
-        
-        if os.path.exists(local_path):
-            return f'/static/images/{local_filename}'
-        
-        resp = requests.get(img_url, timeout=10, headers={
-            'User-Agent': 'Mozilla/5.0',
-            'Referer': 'https://xz.aliyun.com/'
-        })
-        
-        if resp.status_code == 200:
-            with open(local_path, 'wb') as f:
-                f.write(resp.content)
-            return f'/static/images/{local_filename}'
-    except Exception as e:
-        logger.debug(f"图片下载失败: {img_url[:50]}... - {e}")
+    local_filename = _local_image_name(img_url)
+    if local_filename in _saved_images:
+        return f'/static/images/{local_filename}'
+    
+    local_path = os.path.join(STATIC_DIR, local_filename)
+    if os.path.exists(local_path):
+        _saved_images.add(local_filename)
+        return f'/static/images/{local_filename}'
+    
+    for attempt in range(IMAGE_RETRIES + 1):
+        try:
+            async with session.get(img_url) as resp:
+                if resp.status != 200:
+                    return None
+                if (resp.content_length or 0) > MAX_IMAGE_BYTES:
+                    logger.debug(f"图片过大,跳过: {img_url[:50]}...")
+                    return None
+                
+                # write to a unique temp file so a broken or concurrent download never
+                # leaves a partial image behind the exists check
+                fd, tmp_path = tempfile.mkstemp(dir=STATIC_DIR, suffix='.part')
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        async for chunk in resp.content.iter_chunked(64 * 1024):
+                            f.write(chunk)
+                    os.replace(tmp_path, local_path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+                _saved_images.add(local_filename)
+                return f'/static/images/{local_filename}'
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt == IMAGE_RETRIES:
+                logger.debug(f"图片下载失败: {img_url[:50]}... - {e}")
+            else:
+                await asyncio.sleep(0.2 * 2 ** attempt)
+        except Exception as e:
+            logger.debug(f"图片下载失败: {img_url[:50]}... - {e}")
+            break
     
     return None
 
-def process_images_in_html(html_content: str) -> str:
+def _is_display_none(declaration: str) -> bool:
+    """
+    args:
+        declaration: [str] one `property: value` pair of a style attribute
+    return:
+        is_display_none: [bool]
+    """
+    prop, _, value = declaration.partition(':')
+    value = value.strip().lower()
+    if value.endswith('!important'):
+        value = value[:-len('!important')].strip()
+    return prop.strip().lower() == 'display' and value == 'none'
+
+def strip_hidden_styles(root) -> bool:
     """
     args:
+        root: [LexborNode] modified in place
+    return:
+        changed: [bool]
+    """
+    changed = False
+    for node in root.css('[style]'):
+        style = node.attributes.get('style') or ''
+        declarations = [decl for decl in style.split(';') if decl.strip()]
+        kept = [decl for decl in declarations if not _is_display_none(decl)]
+        if len(kept) == len(declarations):
+            continue
+        changed = True
+        stripped = ';'.join(kept).strip()
+        if stripped:
+            node.attrs['style'] = stripped
+        else:
+            del node.attrs['style']
+    return changed
+
+async def localize_images(session: aiohttp.ClientSession, root) -> bool:
+    """
+    args:
+        session: [aiohttp.ClientSession]
+        root: [LexborNode] modified in place
+    return:
+        changed: [bool]
+    """
+    imgs = [img for img in root.css('img')
+            if (img.attributes.get('src') or '').startswith('http')]
+    if not imgs:
+        return False
+    
+    urls = list(dict.fromkeys(img.attributes['src'] for img in imgs))
+    results = await asyncio.gather(*(download_image(session, url) for url in urls))
+    local_paths = dict(zip(urls, results))
+    
+    changed = False
+    for img in imgs:
+        local_path = local_paths[img.attributes['src']]
+        if local_path:
+            img.attrs['src'] = local_path
+            changed = True
+    return changed
+
+async def process_article_html(session: aiohttp.ClientSession, html_content: str,
+                               hidden_styles=False) -> str:
+    """
+    args:
+        session: [aiohttp.ClientSession]
         html_content: [str]
+        hidden_styles: [bool] strip display:none left by the new-version viewer
     return:
         processed_html: [str]
     """
-    # <img class="img-fluid" src='https://example.com/images/pic1.png' alt="Picture 1" style="width: 100%;">
-    # <img src="./local/assets/image.gif">
-    def replace_img(match) -> str:
-        img_tag = match.group(0)
-        src_match = re.search(r'src=["\']([^"\']+)["\']', img_tag)
-        
-        if src_match:
-            original_src = src_match.group(1)
-            if original_src.startswith('http'):
-                local_path = download_image(original_src)
-                if local_path:
-                    new_img_tag = img_tag.replace(original_src, local_path)
-                    return new_img_tag
-        return img_tag
-    
-    processed_html = re.sub(r'<img[^>]+>', replace_img, html_content)
-    return processed_html
+    # parse inside a container so leading <style>/<script> are not hoisted into <head>
+    root = LexborHTMLParser(f'<div>{html_content}</div>').body.css_first('div')
+    changed = strip_hidden_styles(root) if hidden_styles else False
+    changed = await localize_images(session, root) or changed
+    # only reserialize when something was rewritten, the parser normalises the rest
+    return root.inner_html if changed else html_content
+
+INSERT_ARTICLE_SQL = '''
+INSERT OR REPLACE INTO articles (id, title, author, url, category, content_html)
+VALUES (?, ?, ?, ?, ?, ?)
+'''
 
-def save_article(article_data: dict) -> bool:
+def save_articles(articles: list) -> list:
     """
     args:
-        article_data: [dict]
+        articles: [list] article_data dicts, written in one transaction
     return:
-        success: [bool]        
+        saved: [list] article_data dicts that made it into the database
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_conn()
     cursor = conn.cursor()
     
     try:
-        cursor.execute('''
-        INSERT OR REPLACE INTO articles (id, title, author, url, category, content_html)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
+        cursor.executemany(INSERT_ARTICLE_SQL, [(
             article_data['id'],
             article_data['title'],
             article_data['author'],
             article_data['url'],
             article_data['category'],
             article_data['content_html']
-        ))
+        ) for article_data in articles])
         conn.commit()
-        return True
+        return list(articles)
     except Exception as e:
-        logger.error(f"保存失败 (ID:{article_data.get('id')}): {e}")
-        return False
-    finally:
-        conn.close()
+        conn.rollback()
+        logger.warning(f"批量保存失败,逐条重试: {e}")
+    
+    # one bad row should not cost the rest of the batch
+    saved = []
+    for article_data in articles:
+        try:
+            cursor.execute(INSERT_ARTICLE_SQL, (
+                article_data['id'],
+                article_data['title'],
+                article_data['author'],
+                article_data['url'],
+                article_data['category'],
+                article_data['content_html']
+            ))
+            conn.commit()
+            saved.append(article_data)
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"保存失败 (ID:{article_data.get('id')}): {e}")
+    return saved
 
 def is_empty_article(title: str, article_id: int) -> bool:
     """
@@ -145,168 +320,185 @@ def is_empty_article(title: str, article_id: int) -> bool:
     """
     return title == f'文章 {article_id}' or not title or title.strip() == ''
 
-def scrape_single_article(article_id: int) -> dict:
+async def block_heavy_resources(route) -> None:
     """
     args:
+        route: [playwright.async_api.Route]
+    return:
+        None
+    """
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def scrape_single_article(browser, session: aiohttp.ClientSession,
+                                sem: asyncio.Semaphore, article_id: int) -> dict:
+    """
+    args:
+        browser: [playwright.async_api.Browser]
+        session: [aiohttp.ClientSession]
+        sem: [asyncio.Semaphore] caps pages open at once
         article_id: [int]
     return:
         article_data: [dict]
     """
-    if article_exists(article_id):
-        logger.info(f"ID {article_id}: 已存在于数据库,跳过")
-        return {'status': 'exists', 'id': article_id}
-    
     url = f'https://xz.aliyun.com/news/{article_id}'
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            
-            if article_id <= ARTICLE_VERSION_THRESHOLD:
-                page.goto(url, timeout=30000, wait_until='domcontentloaded')
-                time.sleep(1.5)
-                
-                title_elem = page.query_selector('.detail_title')
-                title = title_elem.inner_text().strip() if title_elem else f'文章 {article_id}'
-                
-                author_elem = page.query_selector('.username')
-                author = author_elem.inner_text().strip() if author_elem else '未知作者'
-                
-                category_elem = page.query_selector('.cates_span')
-                category = category_elem.inner_text().strip() if category_elem else ''
-                
-                content_elem = page.query_selector('.detail_content, #markdown-body')
-                content_html = content_elem.inner_html() if content_elem else '<p>无内容</p>'
-                
-            else:
-                logger.info(f"ID {article_id}: 检测到新版页面,执行滚动加载...")
-                page.goto(url, timeout=60000, wait_until='domcontentloaded')
-                page.evaluate("""
-                    async () => {
-                        await new Promise((resolve) => {
-                            var totalHeight = 0;
-                            var distance = 100;
-                            var timer = setInterval(() => {
-                                var scrollHeight = document.body.scrollHeight;
-                                window.scrollBy(0, distance);
-                                totalHeight += distance;
-
-                                if(totalHeight >= scrollHeight){
-                                    clearInterval(timer);
-                                    resolve();
-                                }
-                            }, 50);
-                        });
-                    }
-                """)
-                time.sleep(2)
-                
-                page.evaluate("""
-                    () => {
-                        document.querySelectorAll('.ne-codeblock').forEach(el => {
-                            el.style.display = 'block';
-                        });
-                        document.querySelectorAll('[style*="display: none"]').forEach(el => {
-                            el.style.display = '';
-                        });
-                    }
-                """)
-                time.sleep(0.5)
-                
-                code_cards = page.query_selector_all('ne-card[data-card-name="codeblock"]')
-                if code_cards:
-                    logger.info(f"ID {article_id}: 发现 {len(code_cards)} 个代码块")
-                
-                time.sleep(1)
-                
-                title_elem = page.query_selector('.detail_title')
-                title = title_elem.inner_text().strip() if title_elem else f'文章 {article_id}'
-                
-                author_elem = page.query_selector('.username')
-                author = author_elem.inner_text().strip() if author_elem else '未知作者'
-                
-                category_elem = page.query_selector('.cates_span')
-                category = category_elem.inner_text().strip() if category_elem else ''
-                
-                content_elem = page.query_selector('.ne-viewer-body')
-                if not content_elem:
-                    content_elem = page.query_selector('.detail_content, #markdown-body')
-                
-                if content_elem:
-                    content_html = content_elem.inner_html()
+        async with sem:
+            page = await browser.new_page()
+            try:
+                await page.route('**/*', block_heavy_resources)
+                if article_id <= ARTICLE_VERSION_THRESHOLD:
+                    await page.goto(url, timeout=30000, wait_until='domcontentloaded')
+                    await asyncio.sleep(1.5)
+                    
+                    title_elem = await page.query_selector('.detail_title')
+                    title = (await title_elem.inner_text()).strip() if title_elem else f'文章 {article_id}'
+                    
+                    author_elem = await page.query_selector('.username')
+                    author = (await author_elem.inner_text()).strip() if author_elem else '未知作者'
+                    
+                    category_elem = await page.query_selector('.cates_span')
+                    category = (await category_elem.inner_text()).strip() if category_elem else ''
+                    
+                    content_elem = await page.query_selector('.detail_content, #markdown-body')
+                    content_html = await content_elem.inner_html() if content_elem else '<p>无内容</p>'
+                    
                 else:
-                    content_html = '<p>无内容</p>'
-                
-                content_html = re.sub(
-                    r'style="([^"]*?)display:\s*none;?([^"]*?)"',
-                    lambda m: f'style="{m.group(1)}{m.group(2)}"'.replace('style=""', ''),
-                    content_html
-                )
-                content_html = re.sub(r'\s*style=""', '', content_html)
-            
-            browser.close()
-            
-            if is_empty_article(title, article_id):
-                return {'status': 'skip', 'id': article_id}
-            
-            content_html = process_images_in_html(content_html)
-            
-            article_data = {
-                'status': 'success',
-                'id': article_id,
-                'title': title,
-                'author': author,
-                'url': url,
-                'category': category,
-                'content_html': content_html
-            }
-            
-            return article_data
+                    logger.info(f"ID {article_id}: 检测到新版页面,执行滚动加载...")
+                    await page.goto(url, timeout=60000, wait_until='domcontentloaded')
+                    try:
+                        await page.wait_for_selector(NEW_VIEWER_SELECTOR, state='attached',
+                                                     timeout=NEW_VIEWER_TIMEOUT)
+                    except PlaywrightTimeoutError:
+                        try:
+                            await page.wait_for_selector(OLD_CONTENT_SELECTOR, state='attached',
+                                                         timeout=OLD_CONTENT_TIMEOUT)
+                        except PlaywrightTimeoutError:
+                            # missing content is reported as '无内容' below
+                            pass
+                    try:
+                        await page.wait_for_function(SCROLL_JS, polling=100, timeout=SCROLL_TIMEOUT)
+                    except PlaywrightTimeoutError:
+                        # page kept growing, take whatever has rendered so far
+                        pass
+                    
+                    await page.evaluate(UNHIDE_JS)
+                    
+                    code_cards = await page.query_selector_all('ne-card[data-card-name="codeblock"]')
+                    if code_cards:
+                        logger.info(f"ID {article_id}: 发现 {len(code_cards)} 个代码块")
+                    
+                    title_elem = await page.query_selector('.detail_title')
+                    title = (await title_elem.inner_text()).strip() if title_elem else f'文章 {article_id}'
+                    
+                    author_elem = await page.query_selector('.username')
+                    author = (await author_elem.inner_text()).strip() if author_elem else '未知作者'
+                    
+                    category_elem = await page.query_selector('.cates_span')
+                    category = (await category_elem.inner_text()).strip() if category_elem else ''
+                    
+                    content_elem = await page.query_selector(NEW_VIEWER_SELECTOR)
+                    if not content_elem:
+                        content_elem = await page.query_selector(OLD_CONTENT_SELECTOR)
+                    
+                    if content_elem:
+                        content_html = await content_elem.inner_html()
+                    else:
+                        content_html = '<p>无内容</p>'
+            finally:
+                await page.close()
+        
+        if is_empty_article(title, article_id):
+            return {'status': 'skip', 'id': article_id}
+        
+        # images are fetched outside the semaphore so the next page can start loading
+        content_html = await process_article_html(
+            session, content_html, hidden_styles=article_id > ARTICLE_VERSION_THRESHOLD
+        )
+        
+        article_data = {
+            'status': 'success',
+            'id': article_id,
+            'title': title,
+            'author': author,
+            'url': url,
+            'category': category,
+            'content_html': content_html
+        }
+        
+        return article_data
     except Exception as e:
         return {'status': 'error', 'id': article_id, 'error': str(e)}
 
-def main(start_id=1, end_id=10, max_workers=5):
-    print(f"Log_File: {log_file}")
-    
-    logger.info(f"{'='*60}")
-    logger.info(f"Start from {start_id} to {end_id} (Processor_workers: {max_workers})")
-    logger.info(f"DB_Path: {DB_PATH}")
-    logger.info(f"Log_File: {log_file}")
-    logger.info(f"{'='*60}")
+async def crawl(start_id: int, end_id: int, max_workers: int) -> None:
+    """
+    args:
+        start_id: [int]
+        end_id: [int]
+        max_workers: [int] pages loading at the same time
+    return:
+        None
+    """
+    existing = await run_db(existing_article_ids, start_id, end_id)
+    article_ids = [article_id for article_id in range(start_id, end_id + 1) if article_id not in existing]
+    logger.info(f"{len(existing)} 篇已存在于数据库,跳过; 待爬取 {len(article_ids)} 篇")
     
     success_count = 0
     skip_count = 0
     fail_count = 0
-    exists_count = 0
+    exists_count = len(existing)
+    pending = []
     
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        future_to_id = {
-            executor.submit(scrape_single_article, article_id): article_id 
-            for article_id in range(start_id, end_id + 1)
-        }
-        
-        for future in as_completed(future_to_id):
-            article_id = future_to_id[future]
-            try:
-                result = future.result()
-                
-                if result['status'] == 'exists':
-                    exists_count += 1
-                elif result['status'] == 'skip':
-                    logger.warning(f"ID {article_id}: blank, skipped")
-                    skip_count += 1
-                elif result['status'] == 'error':
-                    logger.error(f"ID {article_id}: ERROR - {result.get('error', 'unkown error')}")
-                    fail_count += 1
-                elif result['status'] == 'success':
-                    if save_article(result):
-                        logger.info(f"ID {article_id}: {result['title'][:30]}...")
-                        success_count += 1
-                    else:
+    async def flush_pending() -> None:
+        nonlocal success_count, fail_count
+        if not pending:
+            return
+        batch = pending[:]
+        pending.clear()
+        saved = await run_db(save_articles, batch)
+        for article_data in saved:
+            logger.info(f"ID {article_data['id']}: {article_data['title'][:30]}...")
+        success_count += len(saved)
+        fail_count += len(batch) - len(saved)
+    
+    sem = asyncio.Semaphore(max_workers)
+    connector = aiohttp.TCPConnector(limit=IMAGE_CONNECTIONS)
+    # per-socket limits like requests timeout=10, a total cap would fail large images on slow links
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=10)
+    
+    async with async_playwright() as p, \
+            aiohttp.ClientSession(connector=connector, timeout=timeout, headers=IMAGE_HEADERS) as session:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            tasks = [
+                asyncio.ensure_future(scrape_single_article(browser, session, sem, article_id))
+                for article_id in article_ids
+            ]
+            
+            for future in asyncio.as_completed(tasks):
+                try:
+                    result = await future
+                    article_id = result['id']
+                    
+                    if result['status'] == 'skip':
+                        logger.warning(f"ID {article_id}: blank, skipped")
+                        skip_count += 1
+                    elif result['status'] == 'error':
+                        logger.error(f"ID {article_id}: ERROR - {result.get('error', 'unkown error')}")
                         fail_count += 1
-            except Exception as e:
-                logger.error(f"ID {article_id}: - {e}")
-                fail_count += 1
+                    elif result['status'] == 'success':
+                        pending.append(result)
+                        if len(pending) >= SAVE_BATCH_SIZE:
+                            await flush_pending()
+                except Exception as e:
+                    logger.error(f"ERROR - {e}")
+                    fail_count += 1
+        finally:
+            # also runs on Ctrl-C/cancellation so scraped articles are not lost
+            await flush_pending()
+            await browser.close()
     
     logger.info(f"{'='*60}")
     logger.info(f"OK: {success_count} ")
@@ -315,8 +507,18 @@ def main(start_id=1, end_id=10, max_workers=5):
     logger.info(f"ERROR: {fail_count} ")
     logger.info(f"{'='*60}")
 
+def main(start_id=1, end_id=10, max_workers=10):
+    print(f"Log_File: {log_file}")
+    
+    logger.info(f"{'='*60}")
+    logger.info(f"Start from {start_id} to {end_id} (Concurrent_pages: {max_workers})")
+    logger.info(f"DB_Path: {DB_PATH}")
+    logger.info(f"Log_File: {log_file}")
+    logger.info(f"{'='*60}")
+    
+    asyncio.run(crawl(start_id, end_id, max_workers))
+
 if __name__ == '__main__':
-    multiprocessing.freeze_support()
     # main(start_id=16500, end_id=16660, max_workers=3)
     # main(start_id=1, end_id=100, max_workers=3)
     main(start_id=90673, end_id=90738, max_workers=3)